@@ -79,6 +79,9 @@ class AppConfig:
             "APPLICATIONINSIGHTS_CONNECTION_STRING", ""
         )
 
+        # Set when the backend runs from the container image under /app/backend
+        self.APP_IN_CONTAINER = self._get_bool("APP_IN_CONTAINER")
+
         # Cached clients and resources
         self._azure_credentials = None
         self._cosmos_client = None
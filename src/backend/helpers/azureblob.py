@@ -1,10 +1,20 @@
 from helpers.dutils import decorate_all_methods
 from azure.identity import ClientSecretCredential
 from azure.storage.blob import BlobServiceClient
+from azure.core.exceptions import ServiceRequestError, ServiceResponseError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 from app_config import AppConfig
 
 # from finrobot.utils import decorate_all_methods, get_next_weekday
 from functools import wraps
+import threading
+import time
+
+# One credential and container client per process, so the credential's token
+# cache and the client's connection pool are reused across uploads instead of
+# authenticating and opening a new connection for every report
+blobContainer = None
+blobContainerLock = threading.Lock()
 
 def init_blob_api(func):
     @wraps(func)
@@ -25,19 +35,59 @@ def init_blob_api(func):
     return wrapper
 
 
+class CachedTokenCredential:
+    """Hands out the wrapped credential's access token until shortly before it expires."""
+
+    def __init__(self, credential, refreshMargin=60):
+        self.credential = credential
+        self.refreshMargin = refreshMargin
+        self.tokens = {}
+        self.lock = threading.Lock()
+
+    def get_token(self, *scopes, **kwargs):
+        # A claims challenge needs a fresh token, so it bypasses the cache
+        if kwargs.get("claims"):
+            return self.credential.get_token(*scopes, **kwargs)
+        key = (scopes, kwargs.get("tenant_id"))
+        with self.lock:
+            token = self.tokens.get(key)
+            if token is None or token.expires_on - self.refreshMargin <= time.time():
+                token = self.credential.get_token(*scopes, **kwargs)
+                self.tokens[key] = token
+        return token
+
+
+def getBlobContainer():
+    global blobContainer
+    with blobContainerLock:
+        if blobContainer is None:
+            credentials = CachedTokenCredential(ClientSecretCredential(tenantId, clientId, clientSecret))
+            blobService = BlobServiceClient(
+                    "https://{}.blob.core.windows.net".format(blobAccountName), credential=credentials)
+            blobContainer = blobService.get_container_client(blobContainerName)
+    return blobContainer
+
+
+# Connection failures and timeouts are worth another try; HTTP error responses
+# are already retried by the storage client's own retry policy where it makes sense
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=0.2),
+    retry=retry_if_exception_type((ServiceRequestError, ServiceResponseError, TimeoutError)),
+    reraise=True,
+)
+def uploadBlob(data, blobName):
+    blobClient = getBlobContainer().get_blob_client(blobName)
+    blobClient.upload_blob(data, overwrite=True)
+    return blobClient.url
+
+
 @decorate_all_methods(init_blob_api)
 class azureBlobApi:
 
-    def copyReport(downloadPath, blobName):
+    def uploadReport(reportBytes, blobName):
         try:
-            with open(downloadPath, "rb") as file:
-                readBytes = file.read()
-            credentials = ClientSecretCredential(tenantId, clientId, clientSecret)
-            blobService = BlobServiceClient(
-                    "https://{}.blob.core.windows.net".format(blobAccountName), credential=credentials)
-            blobClient = blobService.get_blob_client(container=blobContainerName, blob=blobName)
-            blobClient.upload_blob(readBytes,overwrite=True)
-            return blobClient.url
+            return uploadBlob(reportBytes, blobName)
         except Exception as e:
-            print("Error in copyReport: ", e)
-            return None
\ No newline at end of file
+            print("Error in uploadReport: ", e)
+            return None
@@ -22,14 +22,14 @@ from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
 from helpers.fmputils import fmpUtils
 from helpers.yfutils import yfUtils
 from helpers.analyzers import ReportAnalysisUtils
-from typing import Annotated
+from typing import Annotated, BinaryIO
 
 
 class ReportLabUtils:
 
     def build_annual_report(
         ticker_symbol: Annotated[str, "ticker symbol"],
-        save_path: Annotated[str, "path to save the annual report pdf"],
+        save_path: Annotated[str | BinaryIO, "path or binary file object to save the annual report pdf"],
         operating_results: Annotated[
             str,
             "a paragraph of text: the company's income summarization from its financial report",
@@ -68,15 +68,19 @@ class ReportLabUtils:
             right_column_width = page_width - left_column_width
             margin = 4
 
-            pdf_path = (
-                os.path.join(save_path, f"{ticker_symbol}_Equity_Research_report.pdf")
-                if os.path.isdir(save_path)
-                else save_path
-            )
-            os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
-            # Delete the file if it already exists
-            if os.path.exists(pdf_path):
-                os.remove(pdf_path)
+            if hasattr(save_path, "write"):
+                # Write straight into the caller's buffer
+                pdf_path = save_path
+            else:
+                pdf_path = (
+                    os.path.join(save_path, f"{ticker_symbol}_Equity_Research_report.pdf")
+                    if os.path.isdir(save_path)
+                    else save_path
+                )
+                os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
+                # Delete the file if it already exists
+                if os.path.exists(pdf_path):
+                    os.remove(pdf_path)
             doc = SimpleDocTemplate(pdf_path, pagesize=pagesizes.A4)
         
             frame_left = Frame(
@@ -7,7 +7,13 @@ from typing import Annotated
 
 SavePathType = Annotated[str, "File path to save data. If None, data is not saved."]
 
+# Returned by summarize when the model call fails
+SUMMARIZE_FAILED = "I am sorry, I am unable to summarize the input at this time."
+
 def summarize(description: str) -> str:
+    # Nothing to summarize, so skip the round-trip to the model
+    if not description or description.isspace():
+        return description
     try:
         print("*"*35)
         print("Calling summarize")
@@ -48,9 +54,11 @@ def summarize(description: str) -> str:
         return json.loads(response_json.text)['choices'][0]['message']['content']
     except Exception as e:
         print("Error in summarize:", e)
-        return "I am sorry, I am unable to summarize the input at this time."
+        return SUMMARIZE_FAILED
 
 def summarizeTopic(description: str, topic:str) -> str:
+    if not description or description.isspace():
+        return description
     try:
         print("*"*35)
         print("Calling summarizeTopic")
@@ -5,7 +5,7 @@ from functools import wraps
 from helpers.dutils import decorate_all_methods
 from helpers.summarizeutils import get_next_weekday, save_output, SavePathType
 import random
-from datetime import datetime
+from datetime import date, datetime
 
 def init_ticker(func: Callable) -> Callable:
     """Decorator to initialize yf.Ticker and pass it to the function."""
@@ -24,10 +24,10 @@ class yfUtils:
     def get_stock_data(
         symbol: Annotated[str, "ticker symbol"],
         start_date: Annotated[
-            str, "start date for retrieving stock price data, YYYY-mm-dd"
+            str | date, "start date for retrieving stock price data, YYYY-mm-dd"
         ],
         end_date: Annotated[
-            str, "end date for retrieving stock price data, YYYY-mm-dd"
+            str | date, "end date for retrieving stock price data, YYYY-mm-dd"
         ],
         save_path: SavePathType = None,
     ) -> DataFrame:
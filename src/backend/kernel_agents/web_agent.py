@@ -6,7 +6,6 @@ from context.cosmos_memory_kernel import CosmosMemoryContext
 from kernel_agents.agent_base import BaseAgent
 from kernel_tools.web_tools import WebTools
 from models.messages_kernel import AgentType
-from semantic_kernel.functions import KernelFunction
 from azure.ai.projects.models import BingGroundingTool
 from app_config import config
 from pydantic import Field
@@ -51,9 +50,8 @@ class WebAgent(BaseAgent):
         """
         # Load configuration if tools not provided
         if not tools:
-            # Get tools directly from WebTools class
-            tools_dict = WebTools.get_all_kernel_functions()
-            tools = [KernelFunction.from_method(func) for func in tools_dict.values()]
+            # Get tools directly from WebTools class; the wrappers are built once per process
+            tools = WebTools.get_kernel_function_objects()
 
             # Use system message from config if not explicitly provided
         if not system_message:
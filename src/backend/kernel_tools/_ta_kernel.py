@@ -0,0 +1,258 @@
+"""Single-pass technical indicator kernel for TechnicalAnalysisTools.
+
+The technical analysis tool only reports the latest value of each indicator
+(plus the previous EMAs for the crossover check), so instead of building a
+full pandas Series per indicator the kernel runs one loop over the raw OHLC
+arrays, keeps the recurrences in scalars, and returns just those values.
+The formulas follow the ``ta`` library the tool used before.
+"""
+
+import math
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernel then runs as plain Python
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+EMA_SHORT_WINDOW = 12
+EMA_LONG_WINDOW = 26
+MACD_SIGNAL_WINDOW = 9
+RSI_WINDOW = 14
+BB_WINDOW = 20
+BB_DEV = 2.0
+STOCH_WINDOW = 14
+STOCH_SMOOTH_WINDOW = 3
+ATR_WINDOW = 14
+ADX_WINDOW = 14
+
+
+@njit(cache=True)
+def _ewm_update(mean, weight, x, alpha):
+    """One step of pandas ``ewm(alpha=alpha, adjust=False).mean()``.
+
+    Returns the new (mean, weight). As with pandas' default ignore_na=False, a
+    NaN input keeps the mean but still decays the weight of the old value.
+    """
+    if math.isnan(mean):
+        if math.isnan(x):
+            return mean, weight
+        return x, 1.0
+    weight *= 1.0 - alpha
+    if not math.isnan(x):
+        if mean != x:
+            mean = (weight * mean + alpha * x) / (weight + alpha)
+        weight = 1.0
+    return mean, weight
+
+
+@njit(cache=True)
+def compute_all(o, h, l, c):
+    """Compute the latest indicator values from open/high/low/close arrays.
+
+    Returns a tuple of
+    (ema_short_prev, ema_short, ema_long_prev, ema_long, rsi, macd, macd_signal,
+    macd_hist, bb_high, bb_mid, bb_low, stoch_k, stoch_d, atr, adx, plus_di,
+    minus_di, is_hammer, is_bullish_engulfing). Values that need more bars than
+    are available are NaN.
+    """
+    n = c.shape[0]
+    nan = math.nan
+
+    alpha_short = 2.0 / (EMA_SHORT_WINDOW + 1)
+    alpha_long = 2.0 / (EMA_LONG_WINDOW + 1)
+    alpha_sig = 2.0 / (MACD_SIGNAL_WINDOW + 1)
+    alpha_rsi = 1.0 / RSI_WINDOW
+
+    # EMAs start at the first non-NaN close; obs counts the non-NaN closes seen
+    ema_short, w_short = _ewm_update(nan, 1.0, c[0], alpha_short)
+    ema_long, w_long = _ewm_update(nan, 1.0, c[0], alpha_long)
+    obs = 0 if math.isnan(c[0]) else 1
+    obs_prev = 0
+    ema_short_prev = nan
+    ema_long_prev = nan
+    macd = nan
+    macd_sig = nan
+    w_sig = 1.0
+    macd_obs = 0
+    avg_gain = 0.0
+    avg_loss = 0.0
+
+    # Wilder sums for ATR and ADX; the true range at bar 0 is just high - low
+    tr_sum = h[0] - l[0]
+    atr = nan
+    tr_s = 0.0
+    plus_dm_s = 0.0
+    minus_dm_s = 0.0
+    dx_sum = 0.0
+    adx = nan
+    plus_di = nan
+    minus_di = nan
+
+    for i in range(1, n):
+        ci = c[i]
+
+        # EMA (pandas ewm, adjust=False); a NaN close carries the EMAs forward
+        obs_prev = obs
+        if not math.isnan(ci):
+            obs += 1
+        ema_short_prev = ema_short
+        ema_long_prev = ema_long
+        ema_short, w_short = _ewm_update(ema_short, w_short, ci, alpha_short)
+        ema_long, w_long = _ewm_update(ema_long, w_long, ci, alpha_long)
+
+        # MACD and its signal line start once the long EMA is defined
+        if obs >= EMA_LONG_WINDOW:
+            macd = ema_short - ema_long
+            macd_sig, w_sig = _ewm_update(macd_sig, w_sig, macd, alpha_sig)
+            macd_obs += 1
+
+        # RSI (Wilder smoothing of gains and losses)
+        change = ci - c[i - 1]
+        gain = change if change > 0.0 else 0.0
+        loss = -change if change < 0.0 else 0.0
+        avg_gain = alpha_rsi * gain + (1.0 - alpha_rsi) * avg_gain
+        avg_loss = alpha_rsi * loss + (1.0 - alpha_rsi) * avg_loss
+
+        # True range, shared by ATR and ADX
+        prev_close = c[i - 1]
+        tr = max(h[i], prev_close) - min(l[i], prev_close)
+
+        # ATR: mean of the first ATR_WINDOW true ranges, then Wilder smoothing
+        if i < ATR_WINDOW:
+            tr_sum += tr
+            if i == ATR_WINDOW - 1:
+                atr = tr_sum / ATR_WINDOW
+        else:
+            atr = (atr * (ATR_WINDOW - 1) + tr) / ATR_WINDOW
+
+        # Directional movement
+        up = h[i] - h[i - 1]
+        down = l[i - 1] - l[i]
+        plus_dm = up if (up > down and up > 0.0) else 0.0
+        minus_dm = down if (down > up and down > 0.0) else 0.0
+
+        # ADX: sums over the first ADX_WINDOW bars, then Wilder smoothing
+        if i <= ADX_WINDOW:
+            tr_s += tr
+            plus_dm_s += plus_dm
+            minus_dm_s += minus_dm
+        else:
+            tr_s = tr_s - tr_s / ADX_WINDOW + tr
+            plus_dm_s = plus_dm_s - plus_dm_s / ADX_WINDOW + plus_dm
+            minus_dm_s = minus_dm_s - minus_dm_s / ADX_WINDOW + minus_dm
+
+        if i >= ADX_WINDOW:
+            if tr_s != 0.0:
+                plus_di = 100.0 * plus_dm_s / tr_s
+                minus_di = 100.0 * minus_dm_s / tr_s
+            else:
+                plus_di = 0.0
+                minus_di = 0.0
+            di_sum = plus_di + minus_di
+            dx = 100.0 * abs(plus_di - minus_di) / di_sum if di_sum != 0.0 else 0.0
+
+            if i < 2 * ADX_WINDOW:
+                dx_sum += dx
+                if i == 2 * ADX_WINDOW - 1:
+                    adx = dx_sum / ADX_WINDOW
+            else:
+                adx = (adx * (ADX_WINDOW - 1) + dx) / ADX_WINDOW
+
+    # pandas only reports an EMA once it has seen a full window of closes
+    if obs < EMA_SHORT_WINDOW:
+        ema_short = nan
+    if obs_prev < EMA_SHORT_WINDOW:
+        ema_short_prev = nan
+    if obs < EMA_LONG_WINDOW:
+        ema_long = nan
+    if obs_prev < EMA_LONG_WINDOW:
+        ema_long_prev = nan
+    if macd_obs < MACD_SIGNAL_WINDOW:
+        macd_sig = nan
+    macd_hist = macd - macd_sig
+
+    if n < RSI_WINDOW:
+        rsi = nan
+    elif avg_loss == 0.0:
+        rsi = 100.0
+    else:
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    # Bollinger Bands over the last BB_WINDOW closes (population std)
+    bb_high = nan
+    bb_mid = nan
+    bb_low = nan
+    if n >= BB_WINDOW:
+        total = 0.0
+        for j in range(n - BB_WINDOW, n):
+            total += c[j]
+        bb_mid = total / BB_WINDOW
+        sq = 0.0
+        for j in range(n - BB_WINDOW, n):
+            sq += (c[j] - bb_mid) ** 2
+        std = math.sqrt(sq / BB_WINDOW)
+        bb_high = bb_mid + BB_DEV * std
+        bb_low = bb_mid - BB_DEV * std
+
+    # Stochastic %K for the last STOCH_SMOOTH_WINDOW bars; %D is their mean. A
+    # window with no price range has an undefined %K, which makes %D NaN too
+    stoch_k = nan
+    stoch_d = nan
+    if n >= STOCH_WINDOW + STOCH_SMOOTH_WINDOW - 1:
+        k_sum = 0.0
+        for end in range(n - STOCH_SMOOTH_WINDOW, n):
+            lowest = l[end]
+            highest = h[end]
+            for j in range(end - STOCH_WINDOW + 1, end):
+                lowest = min(lowest, l[j])
+                highest = max(highest, h[j])
+            price_range = highest - lowest
+            if price_range == 0.0:
+                stoch_k = nan
+            else:
+                stoch_k = 100.0 * (c[end] - lowest) / price_range
+            k_sum += stoch_k
+        stoch_d = k_sum / STOCH_SMOOTH_WINDOW
+
+    # Candlestick patterns on the last bar (and the one before it)
+    body = abs(c[n - 1] - o[n - 1])
+    lower_wick = min(c[n - 1], o[n - 1]) - l[n - 1]
+    upper_wick = h[n - 1] - max(c[n - 1], o[n - 1])
+    is_hammer = lower_wick >= 2.0 * body and upper_wick <= 0.5 * body
+
+    # Bullish engulfing: a red candle followed by a larger green one closing above its open
+    is_bullish_engulfing = False
+    if n > 1:
+        is_bullish_engulfing = (
+            c[n - 2] < o[n - 2]
+            and c[n - 1] > o[n - 1]
+            and body > abs(c[n - 2] - o[n - 2])
+            and c[n - 1] > o[n - 2]
+        )
+
+    return (
+        ema_short_prev,
+        ema_short,
+        ema_long_prev,
+        ema_long,
+        rsi,
+        macd,
+        macd_sig,
+        macd_hist,
+        bb_high,
+        bb_mid,
+        bb_low,
+        stoch_k,
+        stoch_d,
+        atr,
+        adx,
+        plus_di,
+        minus_di,
+        is_hammer,
+        is_bullish_engulfing,
+    )
@@ -1,29 +1,89 @@
-import inspect
-import json
-from typing import Any, Dict, List, get_type_hints
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Tuple
 from datetime import date, timedelta
 
-import ta  # Importing the technical analysis library
+import numpy as np
+import pandas as pd
 from semantic_kernel.functions import kernel_function
 from models.messages_kernel import AgentType
 
-from helpers.fmputils import *
-from helpers.yfutils import *
-
-class TechnicalAnalysisTools:
+from helpers.yfutils import yfUtils
+from kernel_tools._ta_kernel import compute_all
+from kernel_tools.tools_base import KernelToolsMixin
+
+# Score contribution of each indicator signal: +1 bullish, -1 bearish, 0 neutral
+_SIGNAL_SCORE = {
+    "bullish": 1,
+    "oversold": 1,
+    "bullish_trend": 1,
+    "bearish": -1,
+    "overbought": -1,
+    "bearish_trend": -1,
+    "neutral": 0,
+    "neutral_trend": 0,
+}
+
+# Daily bars per ticker with the day they were fetched; later calls only download
+# the bars added since then
+_price_cache: Dict[str, Tuple[date, pd.DataFrame]] = {}
+_price_cache_lock = threading.Lock()
+
+# Tickers that returned no data, with the time of the lookup; retries within
+# _BAD_TICKER_TTL seconds are answered without calling yfinance again
+_BAD_TICKER_TTL = 300
+_bad_tickers: Dict[str, float] = {}
+
+
+def _get_price_history(ticker_symbol: str) -> pd.DataFrame:
+    """One year of daily bars for a ticker, in ascending date order."""
+    today = date.today()
+    start = today - timedelta(days=365)
+    with _price_cache_lock:
+        cached = _price_cache.get(ticker_symbol)
+
+    if cached is not None and cached[0] == today:
+        return cached[1]
+
+    if cached is None:
+        df = yfUtils.get_stock_data(ticker_symbol, start, today)
+    else:
+        # Re-fetch from the last cached bar so a revised close replaces the old one
+        history = cached[1]
+        new_bars = yfUtils.get_stock_data(ticker_symbol, history.index[-1].date(), today)
+        df = history
+        if not new_bars.empty:
+            df = pd.concat([history, new_bars])
+            df = df[~df.index.duplicated(keep="last")]
+        df = df[df.index.date >= start]
+
+    if df.empty:
+        return df
+
+    # Only the prices feed the indicators; yfinance already returns bars in order
+    df = df[["Open", "High", "Low", "Close"]]
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(ascending=True)
+    with _price_cache_lock:
+        _price_cache[ticker_symbol] = (today, df)
+    return df
+
+
+class TechnicalAnalysisTools(KernelToolsMixin):
 
     agent_name = AgentType.TECHNICAL.value
 
     # Define Company Analyst tools (functions)
     @staticmethod
-    @kernel_function(description="Perform multiple technical analysis strategies using the ta library. "
+    @kernel_function(description="Perform multiple technical analysis strategies. "
                 "Calculates EMA crossover, RSI, MACD (with zero-line checks), Bollinger Bands, "
                 "Stochastics, ATR, ADX, and detects basic candlestick patterns. "
                 "Returns JSON with analysis and a naive 'overall_rating'.")
     async def run_enhanced_technical_analysis(ticker_symbol: str) -> Dict[str, Any]:
         """
         1) Download OHLC data for the given ticker (6mo daily)
-        2) Compute multiple indicators using 'ta' (EMA, RSI, MACD, Bollinger, Stochastics, ATR, ADX, etc.)
+        2) Compute multiple indicators in a single pass over the OHLC arrays (EMA, RSI, MACD, Bollinger, Stochastics, ATR, ADX, etc.)
         3) Use TA-Lib to detect multiple candlestick patterns (expanded set)
         4) Fetch fundamental data (naive from yfinance) and get a simple news sentiment score
         5) Aggregate everything (technical signals, candlestick patterns, fundamentals, sentiment)
@@ -34,20 +94,24 @@ class TechnicalAnalysisTools:
         # --------------------
         # 1. Fetch Price Data
         # --------------------
-        end_date = date.today().strftime("%Y-%m-%d")
-        start_date = (date.today() - timedelta(days=365)).strftime("%Y-%m-%d")
-        df = yfUtils.get_stock_data(ticker_symbol, start_date, end_date)
+        no_data = {
+            "ticker_symbol": ticker_symbol,
+            "error": "No data found",
+            "analysis": {}
+        }
+        # A ticker that just returned no data is not looked up again right away
+        failed_at = _bad_tickers.get(ticker_symbol)
+        if failed_at is not None and time.monotonic() - failed_at < _BAD_TICKER_TTL:
+            return no_data
+
+        # yfinance blocks on HTTP, so fetch off the event loop
+        df = await asyncio.to_thread(_get_price_history, ticker_symbol)
 
             # If no data, return an empty result
         if df.empty:
-            return {
-                "ticker_symbol": ticker_symbol,
-                "error": "No data found",
-                "analysis": {}
-            }
-
-        # Ensure df is in ascending date order
-        df.sort_index(ascending=True, inplace=True)
+            _bad_tickers[ticker_symbol] = time.monotonic()
+            return no_data
+        _bad_tickers.pop(ticker_symbol, None)
 
         # Prepare the result structure
         analysis_result = {
@@ -64,69 +128,57 @@ class TechnicalAnalysisTools:
             }
         }
 
-        # -------------------------------------------------------------
-        # 2. Calculate Technical Indicators (ta library)
-        # -------------------------------------------------------------
-        # A) EMA Cross
-        short_window = 12
-        long_window = 26
-        df["EMA_Short"] = ta.trend.EMAIndicator(close=df["Close"], window=short_window).ema_indicator()
-        df["EMA_Long"] = ta.trend.EMAIndicator(close=df["Close"], window=long_window).ema_indicator()
-
-        # B) RSI
-        df["RSI"] = ta.momentum.RSIIndicator(close=df["Close"], window=14).rsi()
-
-        # C) MACD
-        macd_indicator = ta.trend.MACD(close=df["Close"], window_slow=26, window_fast=12, window_sign=9)
-        df["MACD"] = macd_indicator.macd()
-        df["MACD_Signal"] = macd_indicator.macd_signal()
-        df["MACD_Hist"] = macd_indicator.macd_diff()
-
-        # D) Bollinger Bands
-        bollinger = ta.volatility.BollingerBands(close=df["Close"], window=20, window_dev=2)
-        df["BB_High"] = bollinger.bollinger_hband()
-        df["BB_Low"] = bollinger.bollinger_lband()
-        df["BB_Mid"] = bollinger.bollinger_mavg()
-
-        # E) Stochastics
-        stoch = ta.momentum.StochasticOscillator(
-            high=df["High"], low=df["Low"], close=df["Close"], window=14, smooth_window=3
-        )
-        df["Stoch_%K"] = stoch.stoch()
-        df["Stoch_%D"] = stoch.stoch_signal()
-
-        # F) ATR
-        atr_indicator = ta.volatility.AverageTrueRange(
-            high=df["High"], low=df["Low"], close=df["Close"], window=14
+        # Open/High/Low/Close as one row each, so every series the kernel loops
+        # over is contiguous in memory
+        ohlc = np.ascontiguousarray(
+            df[["Open", "High", "Low", "Close"]].to_numpy(dtype=np.float64).T
         )
-        df["ATR"] = atr_indicator.average_true_range()
 
-        # G) ADX
-        adx_indicator = ta.trend.ADXIndicator(
-            high=df["High"], low=df["Low"], close=df["Close"], window=14
-        )
-        df["ADX"] = adx_indicator.adx()
-        df["+DI"] = adx_indicator.adx_pos()
-        df["-DI"] = adx_indicator.adx_neg()
+        # -------------------------------------------------------------
+        # 2. Calculate Technical Indicators (single-pass kernel)
+        # -------------------------------------------------------------
+        # EMA cross (12/26), RSI (14), MACD (12/26/9), Bollinger Bands (20, 2),
+        # Stochastics (14, 3), ATR (14) and ADX (14); only the latest values
+        # (and the previous EMAs) are used below
+        (
+            prev_short_ema,
+            short_ema,
+            prev_long_ema,
+            long_ema,
+            rsi_value,
+            macd_value,
+            macd_signal_line,
+            macd_hist,
+            bb_high,
+            bb_mid,
+            bb_low,
+            stoch_k,
+            stoch_d,
+            atr_value,
+            adx_value,
+            plus_di,
+            minus_di,
+            is_hammer,
+            is_bullish_engulfing,
+        ) = compute_all(*ohlc)
 
         # --- Derive signals from these indicators ---
-        latest_data = df.iloc[-1]
-        previous_data = df.iloc[-2] if len(df) > 1 else None
+        last_close = ohlc[3, -1]
+        has_previous = ohlc.shape[1] > 1
 
         # EMA Crossover
         ema_signal = "neutral"
-        if previous_data is not None:
-            was_short_below = previous_data["EMA_Short"] <= previous_data["EMA_Long"]
-            is_short_above = latest_data["EMA_Short"] > latest_data["EMA_Long"]
-            was_short_above = previous_data["EMA_Short"] >= previous_data["EMA_Long"]
-            is_short_below = latest_data["EMA_Short"] < latest_data["EMA_Long"]
+        if has_previous:
+            was_short_below = prev_short_ema <= prev_long_ema
+            is_short_above = short_ema > long_ema
+            was_short_above = prev_short_ema >= prev_long_ema
+            is_short_below = short_ema < long_ema
             if was_short_below and is_short_above:
                 ema_signal = "bullish"
             elif was_short_above and is_short_below:
                 ema_signal = "bearish"
 
         # RSI
-        rsi_value = latest_data["RSI"]
         if rsi_value >= 70:
             rsi_signal = "overbought"
         elif rsi_value <= 30:
@@ -135,8 +187,6 @@ class TechnicalAnalysisTools:
             rsi_signal = "neutral"
 
         # MACD Trend
-        macd_value = latest_data["MACD"]
-        macd_signal_line = latest_data["MACD_Signal"]
         if macd_value > macd_signal_line:
             macd_trend = "bullish"
         elif macd_value < macd_signal_line:
@@ -145,16 +195,14 @@ class TechnicalAnalysisTools:
             macd_trend = "neutral"
 
         # Bollinger
-        last_close = latest_data["Close"]
-        if last_close > latest_data["BB_High"]:
+        if last_close > bb_high:
             bb_signal = "close_above_upper_band"
-        elif last_close < latest_data["BB_Low"]:
+        elif last_close < bb_low:
             bb_signal = "close_below_lower_band"
         else:
             bb_signal = "within_band"
 
         # Stochastics
-        stoch_k = latest_data["Stoch_%K"]
         if stoch_k < 20:
             stoch_signal = "oversold"
         elif stoch_k > 80:
@@ -163,9 +211,6 @@ class TechnicalAnalysisTools:
             stoch_signal = "neutral"
 
         # ADX
-        adx_value = latest_data["ADX"]
-        plus_di = latest_data["+DI"]
-        minus_di = latest_data["-DI"]
         adx_trend_strength = "strong_trend" if adx_value > 25 else "weak_or_sideways"
         if plus_di > minus_di:
             adx_trend_direction = "bullish_trend"
@@ -176,10 +221,10 @@ class TechnicalAnalysisTools:
 
         # Populate the 'indicators' field
         analysis_result["indicators"] = {
-            "close_price": float(latest_data["Close"]),
+            "close_price": float(last_close),
             "ema": {
-                "short_ema": float(latest_data["EMA_Short"]),
-                "long_ema": float(latest_data["EMA_Long"]),
+                "short_ema": float(short_ema),
+                "long_ema": float(long_ema),
                 "signal": ema_signal
             },
             "rsi": {
@@ -189,21 +234,21 @@ class TechnicalAnalysisTools:
             "macd": {
                 "value": float(macd_value),
                 "signal_line": float(macd_signal_line),
-                "hist": float(latest_data["MACD_Hist"]),
+                "hist": float(macd_hist),
                 "trend": macd_trend
             },
             "bollinger": {
-                "upper": float(latest_data["BB_High"]),
-                "lower": float(latest_data["BB_Low"]),
-                "mid": float(latest_data["BB_Mid"]),
+                "upper": float(bb_high),
+                "lower": float(bb_low),
+                "mid": float(bb_mid),
                 "signal": bb_signal
             },
             "stochastics": {
                 "%K": float(stoch_k),
-                "%D": float(latest_data["Stoch_%D"]),
+                "%D": float(stoch_d),
                 "signal": stoch_signal
             },
-            "atr": float(latest_data["ATR"]),
+            "atr": float(atr_value),
             "adx": {
                 "adx_value": float(adx_value),
                 "+DI": float(plus_di),
@@ -262,57 +307,26 @@ class TechnicalAnalysisTools:
         # (This is a naive approach for demonstration.)
         pattern_detected = []
 
-        # Hammer detection
-        last_open = latest_data["Open"]
-        candle_body = abs(latest_data["Close"] - last_open)
-        lower_wick = min(latest_data["Close"], last_open) - latest_data["Low"]
-        upper_wick = latest_data["High"] - max(latest_data["Close"], last_open)
-
-        if (lower_wick >= 2 * candle_body) and (upper_wick <= 0.5 * candle_body):
+        # Hammer detection (computed in compute_all with the indicators)
+        if is_hammer:
             pattern_detected.append("possible_hammer")
 
         # Bullish Engulfing detection (naive approach):
         #   - Previous candle is red (close < open)
         #   - Current candle is green (close > open)
         #   - Current candle's body "engulfs" previous body
-        if previous_data is not None:
-            prev_body = abs(previous_data["Close"] - previous_data["Open"])
-            curr_body = abs(latest_data["Close"] - latest_data["Open"])
-            prev_bearish = previous_data["Close"] < previous_data["Open"]
-            curr_bullish = latest_data["Close"] > latest_data["Open"]
-
-            if prev_bearish and curr_bullish and (curr_body > prev_body) and (latest_data["Close"] > previous_data["Open"]):
-                pattern_detected.append("bullish_engulfing")
+        if is_bullish_engulfing:
+            pattern_detected.append("bullish_engulfing")
 
         # Add more advanced patterns or integrate a dedicated pattern library as needed.
 
         # -------------------------------------------------------------
         # 5. Aggregate into Final Rating + Probability
         # -------------------------------------------------------------
-        score = 0
-        max_score = 0
-
-        # Helper method to handle adding signals
-        def add_signal(signal_str: str, weight=1):
-            nonlocal score, max_score
-            max_score += weight
-            if signal_str in ["bullish", "oversold"]:
-                score += 1 * weight
-            elif signal_str in ["bearish", "overbought"]:
-                score -= 1 * weight
-            # "neutral" => no change
-
-        # A) Technical Indicator Signals
-        add_signal(ema_signal, weight=1)
-        add_signal(rsi_signal, weight=1)
-        add_signal(macd_trend, weight=1)
-        add_signal(stoch_signal, weight=1)
-        # ADX direction
-        max_score += 1
-        if adx_trend_direction == "bullish_trend":
-            score += 1
-        elif adx_trend_direction == "bearish_trend":
-            score -= 1
+        # A) Technical Indicator Signals, each with weight 1, plus the ADX direction
+        signals = (ema_signal, rsi_signal, macd_trend, stoch_signal, adx_trend_direction)
+        score = sum(_SIGNAL_SCORE[signal] for signal in signals)
+        max_score = len(signals)
 
         # # B) Candlestick Patterns (last candle only)
         # # - We'll add 1 for bullish pattern, -1 for bearish.
@@ -350,116 +364,3 @@ class TechnicalAnalysisTools:
         }
 
         return analysis_result
-
-
-    @classmethod
-    def generate_tools_json_doc(cls) -> str:
-        """
-        Generate a JSON document containing information about all methods in the class.
-
-        Returns:
-            str: JSON string containing the methods' information
-        """
-
-        tools_list = []
-
-        # Get all methods from the class that have the kernel_function annotation
-        for name, method in inspect.getmembers(cls, predicate=inspect.isfunction):
-            # Skip this method itself and any private methods
-            if name.startswith("_") or name == "generate_tools_json_doc":
-                continue
-
-            # Check if the method has the kernel_function annotation
-            if hasattr(method, "__kernel_function__"):
-                # Get method description from docstring or kernel_function description
-                description = ""
-                if hasattr(method, "__doc__") and method.__doc__:
-                    description = method.__doc__.strip()
-
-                # Get kernel_function description if available
-                if hasattr(method, "__kernel_function__") and getattr(
-                    method.__kernel_function__, "description", None
-                ):
-                    description = method.__kernel_function__.description
-
-                # Get argument information by introspection
-                sig = inspect.signature(method)
-                args_dict = {}
-
-                # Get type hints if available
-                type_hints = get_type_hints(method)
-
-                # Process parameters
-                for param_name, param in sig.parameters.items():
-                    # Skip first parameter 'cls' for class methods (though we're using staticmethod now)
-                    if param_name in ["cls", "self"]:
-                        continue
-
-                    # Get parameter type
-                    param_type = "string"  # Default type
-                    if param_name in type_hints:
-                        type_obj = type_hints[param_name]
-                        # Convert type to string representation
-                        if hasattr(type_obj, "__name__"):
-                            param_type = type_obj.__name__.lower()
-                        else:
-                            # Handle complex types like List, Dict, etc.
-                            param_type = str(type_obj).lower()
-                            if "int" in param_type:
-                                param_type = "int"
-                            elif "float" in param_type:
-                                param_type = "float"
-                            elif "bool" in param_type:
-                                param_type = "boolean"
-                            else:
-                                param_type = "string"
-
-                    # Create parameter description
-                    param_desc = param_name.replace("_", " ")
-                    args_dict[param_name] = {
-                        "description": param_name,
-                        "title": param_name.replace("_", " ").title(),
-                        "type": param_type,
-                    }
-
-                # Add the tool information to the list
-                tool_entry = {
-                    "agent": cls.agent_name,  # Use HR agent type
-                    "function": name,
-                    "description": description,
-                    "arguments": json.dumps(args_dict).replace('"', "'"),
-                }
-
-                tools_list.append(tool_entry)
-
-        # Return the JSON string representation
-        return json.dumps(tools_list, ensure_ascii=False, indent=2)
-
-    # This function does NOT have the kernel_function annotation
-    # because it's meant for introspection rather than being exposed as a tool
-    @classmethod
-    def get_all_kernel_functions(cls) -> dict[str, Callable]:
-        """
-        Returns a dictionary of all methods in this class that have the @kernel_function annotation.
-        This function itself is not annotated with @kernel_function.
-
-        Returns:
-            Dict[str, Callable]: Dictionary with function names as keys and function objects as values
-        """
-        kernel_functions = {}
-
-        # Get all class methods
-        for name, method in inspect.getmembers(cls, predicate=inspect.isfunction):
-            # Skip this method itself and any private/special methods
-            if name.startswith("_") or name == "get_all_kernel_functions":
-                continue
-
-            # Check if the method has the kernel_function annotation
-            # by looking at its __annotations__ attribute
-            method_attrs = getattr(method, "__annotations__", {})
-            if hasattr(method, "__kernel_function__") or "kernel_function" in str(
-                method_attrs
-            ):
-                kernel_functions[name] = method
-
-        return kernel_functions
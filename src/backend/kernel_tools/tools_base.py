@@ -0,0 +1,218 @@
+import functools
+import inspect
+import json
+from typing import Any, Callable, Dict, List, Optional, get_origin, get_type_hints
+
+from semantic_kernel.functions import KernelFunction
+
+
+def _json_default(obj: Any) -> Any:
+    # NumPy scalars and arrays expose tolist()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_to_json(obj: Any, indent: bool = False) -> str:
+    """Serialize obj (including NumPy values) to a JSON string with the stdlib json module."""
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=_json_default)
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=_json_default
+    )
+
+
+try:
+    import orjson
+
+    def to_json(obj: Any, indent: bool = False) -> str:
+        """Serialize obj (including NumPy values) to a JSON string with orjson."""
+        # Non-str keys (ints, dates, ...) are written as strings, as json.dumps does
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option).decode()
+        except TypeError:
+            # orjson rejects some keys json accepts, e.g. NumPy floats
+            return _stdlib_to_json(obj, indent)
+
+    from_json = orjson.loads
+
+except ImportError:
+    to_json = _stdlib_to_json
+    from_json = json.loads
+
+
+# JSON-schema type names for the Python types used in tool signatures
+_TYPE_MAP = {
+    int: "int",
+    float: "float",
+    bool: "boolean",
+    str: "string",
+    list: "array",
+    dict: "object",
+    List: "array",
+    Dict: "object",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _hints(fn: Callable) -> Dict[str, Any]:
+    """Type hints for a tool function; they are fixed once the function is defined."""
+    return get_type_hints(fn)
+
+
+@functools.lru_cache(maxsize=None)
+def _signature(fn: Callable) -> inspect.Signature:
+    """Signature of a tool function; Signature objects are immutable."""
+    return inspect.signature(fn)
+
+
+def _introspect_parameters(fn: Callable) -> List[Dict[str, Any]]:
+    """Parameter metadata for a function not decorated with @kernel_function."""
+    type_hints = _hints(fn)
+    return [
+        {"name": name, "type_object": type_hints.get(name)}
+        for name in _signature(fn).parameters
+    ]
+
+
+def _json_type(type_obj: Any) -> str:
+    """JSON-schema type name for a parameter type; generics resolve via get_origin."""
+    return _TYPE_MAP.get(type_obj) or _TYPE_MAP.get(get_origin(type_obj), "string")
+
+
+class KernelToolsMixin:
+    """Shared introspection helpers for the kernel tools classes.
+
+    Subclasses set agent_name and define their tools as static methods
+    decorated with @kernel_function.
+    """
+
+    agent_name: Optional[str] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # The set of tools is fixed once the class body has run, so collect them now
+        kernel_functions = {}
+        for name, member in cls.__dict__.items():
+            method = getattr(member, "__func__", member)
+            if (
+                inspect.isfunction(method)
+                and not name.startswith("_")
+                and hasattr(method, "__kernel_function__")
+            ):
+                kernel_functions[name] = method
+        cls.__kernel_functions__ = kernel_functions
+        cls._tools_json_doc = cls._build_tools_json_doc()
+
+    @classmethod
+    def generate_tools_json_doc(cls) -> str:
+        """
+        Generate a JSON document containing information about all methods in the class.
+        The document is built when the class is created.
+
+        Returns:
+            str: JSON string containing the methods' information
+        """
+        return cls._tools_json_doc
+
+    @classmethod
+    def _build_tools_json_doc(cls) -> str:
+        """
+        Build the JSON document returned by generate_tools_json_doc.
+
+        Returns:
+            str: JSON string containing the methods' information
+        """
+
+        tools_list = []
+
+        # Get all methods from the class that have the kernel_function annotation.
+        # Read the class __dict__ directly instead of walking the MRO with
+        # inspect.getmembers; staticmethods are unwrapped via __func__.
+        for name, member in cls.__dict__.items():
+            method = getattr(member, "__func__", member)
+            if not inspect.isfunction(method):
+                continue
+
+            # Skip private methods
+            if name.startswith("_"):
+                continue
+
+            # Check if the method has the kernel_function annotation
+            if hasattr(method, "__kernel_function__"):
+                # Prefer the kernel_function description, then the docstring
+                description = (
+                    getattr(method, "__kernel_function_description__", None)
+                    or method.__doc__
+                    or ""
+                ).strip()
+
+                # kernel_function has already parsed the parameters; only fall back
+                # to signature introspection when that metadata is missing
+                parameters = getattr(method, "__kernel_function_parameters__", None)
+                if parameters is None:
+                    parameters = _introspect_parameters(method)
+
+                args_dict = {}
+                for param in parameters:
+                    param_name = param["name"]
+                    # Skip first parameter 'cls' for class methods (though we're using staticmethod now)
+                    if param_name in ["cls", "self"]:
+                        continue
+
+                    args_dict[param_name] = {
+                        "description": param.get("description") or param_name,
+                        "title": param_name.replace("_", " ").title(),
+                        "type": _json_type(param.get("type_object")),
+                    }
+
+                # Add the tool information to the list
+                tool_entry = {
+                    "agent": cls.agent_name,
+                    "function": name,
+                    "description": description,
+                    # A nested object, so the document is valid JSON all the way down
+                    "arguments": args_dict,
+                }
+
+                tools_list.append(tool_entry)
+
+        # Return the JSON string representation
+        return to_json(tools_list, indent=True)
+
+    # This function does NOT have the kernel_function annotation
+    # because it's meant for introspection rather than being exposed as a tool
+    @classmethod
+    def get_all_kernel_functions(cls) -> dict[str, Callable]:
+        """
+        Returns a dictionary of all methods in this class that have the @kernel_function annotation.
+        This function itself is not annotated with @kernel_function. The dictionary is
+        collected when the class is created.
+
+        Returns:
+            Dict[str, Callable]: Dictionary with function names as keys and function objects as values
+        """
+        return cls.__kernel_functions__
+
+    @classmethod
+    def get_kernel_function_objects(cls) -> List[KernelFunction]:
+        """
+        Returns the class's kernel functions wrapped as KernelFunction objects, ready to be
+        passed to an agent as its tools. The wrappers are created on first use and reused
+        by every agent built afterwards; semantic_kernel copies a function when it adds
+        it to a plugin, so sharing them is safe.
+
+        Returns:
+            List[KernelFunction]: A new list holding the shared KernelFunction objects
+        """
+        functions = cls.__dict__.get("_kernel_function_objects")
+        if functions is None:
+            functions = tuple(
+                KernelFunction.from_method(method)
+                for method in cls.__kernel_functions__.values()
+            )
+            cls._kernel_function_objects = functions
+        return list(functions)
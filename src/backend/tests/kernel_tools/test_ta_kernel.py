@@ -0,0 +1,117 @@
+import math
+
+import numpy as np
+import pytest
+
+from kernel_tools._ta_kernel import compute_all
+
+
+def _sample_ohlc(n=252, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1.5, n))
+    open_ = close + rng.normal(0, 0.5, n)
+    high = np.maximum(open_, close) + rng.uniform(0, 1.0, n)
+    low = np.minimum(open_, close) - rng.uniform(0, 1.0, n)
+    return open_, high, low, close
+
+
+def _ta_values(h, l, c):
+    """Latest values of the ta indicators, in the order compute_all returns them."""
+    pd = pytest.importorskip("pandas")
+    ta = pytest.importorskip("ta")
+
+    high, low, close = pd.Series(h), pd.Series(l), pd.Series(c)
+    ema_short = ta.trend.EMAIndicator(close=close, window=12).ema_indicator()
+    ema_long = ta.trend.EMAIndicator(close=close, window=26).ema_indicator()
+    macd = ta.trend.MACD(close=close, window_slow=26, window_fast=12, window_sign=9)
+    bollinger = ta.volatility.BollingerBands(close=close, window=20, window_dev=2)
+    stoch = ta.momentum.StochasticOscillator(
+        high=high, low=low, close=close, window=14, smooth_window=3
+    )
+    adx = ta.trend.ADXIndicator(high=high, low=low, close=close, window=14)
+    return (
+        ema_short.iloc[-2],
+        ema_short.iloc[-1],
+        ema_long.iloc[-2],
+        ema_long.iloc[-1],
+        ta.momentum.RSIIndicator(close=close, window=14).rsi().iloc[-1],
+        macd.macd().iloc[-1],
+        macd.macd_signal().iloc[-1],
+        macd.macd_diff().iloc[-1],
+        bollinger.bollinger_hband().iloc[-1],
+        bollinger.bollinger_mavg().iloc[-1],
+        bollinger.bollinger_lband().iloc[-1],
+        stoch.stoch().iloc[-1],
+        stoch.stoch_signal().iloc[-1],
+        ta.volatility.AverageTrueRange(high=high, low=low, close=close, window=14)
+        .average_true_range()
+        .iloc[-1],
+        adx.adx().iloc[-1],
+        adx.adx_pos().iloc[-1],
+        adx.adx_neg().iloc[-1],
+    )
+
+
+def test_compute_all_matches_ta_library():
+    """Test that the kernel reproduces the latest values of the ta indicators."""
+    o, h, l, c = _sample_ohlc()
+    expected = _ta_values(h, l, c)
+
+    result = compute_all(o, h, l, c)
+
+    assert result[:17] == pytest.approx(expected, rel=1e-9)
+
+
+def test_compute_all_skips_missing_closes_like_ta():
+    """Test that a NaN close is carried over as pandas ewm does, not propagated."""
+    o, h, l, c = _sample_ohlc()
+    c[100] = math.nan
+    # ta's ADX stays NaN after a missing close, so only compare up to the ATR
+    expected = _ta_values(h, l, c)[:14]
+
+    result = compute_all(o, h, l, c)
+
+    assert not any(math.isnan(value) for value in result[:17])
+    assert result[:14] == pytest.approx(expected, rel=1e-9)
+
+
+def test_compute_all_flat_prices():
+    """Test that a window without a price range gives NaN stochastics, not an error."""
+    o = h = l = c = np.full(60, 100.0)
+    expected = _ta_values(h, l, c)
+
+    result = compute_all(o, h, l, c)
+
+    stoch_k, stoch_d = result[11], result[12]
+    assert math.isnan(stoch_k) and math.isnan(stoch_d)
+    assert result[:17] == pytest.approx(expected, rel=1e-9, nan_ok=True)
+
+
+def test_compute_all_returns_nan_without_enough_bars():
+    """Test that indicators needing a longer history are NaN for short inputs."""
+    o, h, l, c = _sample_ohlc(n=20)
+    result = compute_all(o, h, l, c)
+
+    rsi, bb_mid, ema_long, adx = result[4], result[9], result[3], result[14]
+    assert not math.isnan(rsi)
+    assert not math.isnan(bb_mid)
+    assert math.isnan(ema_long)
+    assert math.isnan(adx)
+
+
+def test_compute_all_flags_candlestick_patterns():
+    """Test hammer and bullish engulfing detection on the last two bars."""
+    o = np.array([100.0, 100.0, 104.0, 101.0])
+    h = np.array([101.0, 101.0, 104.5, 106.0])
+    l = np.array([99.0, 99.0, 101.5, 100.5])
+    c = np.array([100.0, 100.0, 102.0, 105.0])
+
+    *_, is_hammer, is_bullish_engulfing = compute_all(o, h, l, c)
+    assert not is_hammer
+    assert is_bullish_engulfing
+
+    # Long lower wick, close near the high
+    h[-1], l[-1], c[-1], o[-1] = 101.2, 95.0, 101.0, 100.0
+    *_, is_hammer, is_bullish_engulfing = compute_all(o, h, l, c)
+    assert is_hammer
+    assert not is_bullish_engulfing
@@ -0,0 +1,121 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kernel_tools import technical_tools
+
+
+def _bars(start: date, days: int, close: float = 100.0) -> pd.DataFrame:
+    index = pd.date_range(start, periods=days, freq="D", tz="America/New_York")
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": 1000,
+        },
+        index=index,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_price_cache():
+    technical_tools._price_cache.clear()
+    technical_tools._bad_tickers.clear()
+    yield
+    technical_tools._price_cache.clear()
+    technical_tools._bad_tickers.clear()
+
+
+def test_price_history_is_reused_on_the_same_day(monkeypatch):
+    """Test that a second call on the same day does not download again."""
+    calls = []
+
+    def fake_get_stock_data(ticker_symbol, start_date, end_date):
+        calls.append((start_date, end_date))
+        return _bars(date.today() - timedelta(days=30), 30)
+
+    monkeypatch.setattr(technical_tools.yfUtils, "get_stock_data", fake_get_stock_data)
+
+    first = technical_tools._get_price_history("MSFT")
+    second = technical_tools._get_price_history("MSFT")
+
+    assert second is first
+    assert len(calls) == 1
+    assert list(first.columns) == ["Open", "High", "Low", "Close"]
+
+
+def test_price_history_only_fetches_new_bars(monkeypatch):
+    """Test that a stale cache entry is extended from its last bar."""
+    today = date.today()
+    history = _bars(today - timedelta(days=10), 9)
+    technical_tools._price_cache["MSFT"] = (today - timedelta(days=1), history)
+    calls = []
+
+    def fake_get_stock_data(ticker_symbol, start_date, end_date):
+        calls.append((start_date, end_date))
+        return _bars(today - timedelta(days=2), 2, close=105.0)
+
+    monkeypatch.setattr(technical_tools.yfUtils, "get_stock_data", fake_get_stock_data)
+
+    df = technical_tools._get_price_history("MSFT")
+
+    assert calls == [(history.index[-1].date(), today)]
+    assert len(df) == 10
+    assert df.index.is_unique and df.index.is_monotonic_increasing
+    # The overlapping bar takes the newly downloaded values
+    assert df["Close"].iloc[-2:].tolist() == [105.0, 105.0]
+
+
+@pytest.mark.asyncio
+async def test_final_decision_sums_signal_scores(monkeypatch):
+    """Test that the ADX direction and indicator signals add up to the score."""
+    today = date.today()
+    df = _bars(today - timedelta(days=200), 200)
+    df["Close"] = np.linspace(100.0, 140.0, 200) + np.tile([0.0, -0.6], 100)
+    df["Open"] = df["Close"] - 0.2
+    df["High"] = df["Close"] + 0.5
+    df["Low"] = df["Open"] - 0.5
+    monkeypatch.setattr(
+        technical_tools.yfUtils, "get_stock_data", lambda *args: df
+    )
+
+    result = await technical_tools.TechnicalAnalysisTools.run_enhanced_technical_analysis(
+        "MSFT"
+    )
+
+    indicators = result["indicators"]
+    assert indicators["macd"]["trend"] == "bearish"
+    assert indicators["adx"]["trend_direction"] == "bullish_trend"
+    assert result["final_decision"] == {
+        "score": 0,
+        "max_score_possible": 5,
+        "probability": 0.5,
+        "rating": "hold",
+    }
+
+
+@pytest.mark.asyncio
+async def test_unknown_ticker_is_not_looked_up_again(monkeypatch):
+    """Test that a ticker without data is answered from the failure cache."""
+    calls = []
+
+    def fake_get_stock_data(ticker_symbol, start_date, end_date):
+        calls.append(ticker_symbol)
+        return pd.DataFrame()
+
+    monkeypatch.setattr(technical_tools.yfUtils, "get_stock_data", fake_get_stock_data)
+
+    tools = technical_tools.TechnicalAnalysisTools
+    first = await tools.run_enhanced_technical_analysis("NOPE")
+    second = await tools.run_enhanced_technical_analysis("NOPE")
+
+    assert first == second == {
+        "ticker_symbol": "NOPE",
+        "error": "No data found",
+        "analysis": {},
+    }
+    assert calls == ["NOPE"]
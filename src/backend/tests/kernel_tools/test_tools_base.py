@@ -0,0 +1,103 @@
+import json
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from semantic_kernel.functions import KernelFunction, kernel_function
+
+from kernel_tools.tools_base import KernelToolsMixin, _json_type, from_json, to_json
+
+
+class SampleTools(KernelToolsMixin):
+    agent_name = "SampleAgent"
+
+    @staticmethod
+    @kernel_function(description="Look up a quote for a ticker")
+    async def get_quote(ticker_symbol: str, days: int) -> str:
+        """Look up a quote for a ticker."""
+        return ticker_symbol
+
+    @staticmethod
+    def not_a_tool() -> str:
+        return "ignored"
+
+
+class OtherTools(SampleTools):
+    agent_name = "OtherAgent"
+
+    @staticmethod
+    @kernel_function(description="Summarize a filing")
+    async def summarize_filing(ticker_symbol: str) -> str:
+        """Summarize a filing."""
+        return ticker_symbol
+
+
+def test_get_all_kernel_functions_only_returns_decorated_methods():
+    """Test that only @kernel_function methods are collected."""
+    functions = SampleTools.get_all_kernel_functions()
+
+    assert list(functions) == ["get_quote"]
+    assert functions["get_quote"] is SampleTools.get_quote
+
+
+def test_generate_tools_json_doc_describes_each_tool():
+    """Test the structure of the generated tools JSON document."""
+    tools = json.loads(SampleTools.generate_tools_json_doc())
+
+    assert len(tools) == 1
+    assert tools[0]["agent"] == "SampleAgent"
+    assert tools[0]["function"] == "get_quote"
+    assert tools[0]["arguments"] == {
+        "ticker_symbol": {
+            "description": "ticker_symbol",
+            "title": "Ticker Symbol",
+            "type": "string",
+        },
+        "days": {"description": "days", "title": "Days", "type": "int"},
+    }
+
+
+def test_generate_tools_json_doc_is_cached_per_class():
+    """Test that the document is reused and not shared with subclasses."""
+    first = SampleTools.generate_tools_json_doc()
+
+    assert SampleTools.generate_tools_json_doc() is first
+
+    other_tools = json.loads(OtherTools.generate_tools_json_doc())
+    assert [tool["function"] for tool in other_tools] == ["summarize_filing"]
+    assert other_tools[0]["agent"] == "OtherAgent"
+
+
+def test_json_type_maps_plain_and_generic_types():
+    """Test the type name lookup for plain types and parametrized generics."""
+    assert _json_type(int) == "int"
+    assert _json_type(bool) == "boolean"
+    assert _json_type(List[str]) == "array"
+    assert _json_type(dict[str, int]) == "object"
+    assert _json_type(Dict[str, int]) == "object"
+    assert _json_type(Optional[int]) == "string"
+    assert _json_type(None) == "string"
+
+
+def test_get_kernel_function_objects_reuses_wrappers():
+    """Test that the KernelFunction wrappers are built once per class."""
+    first = SampleTools.get_kernel_function_objects()
+    second = SampleTools.get_kernel_function_objects()
+
+    assert [function.name for function in first] == ["get_quote"]
+    assert isinstance(first[0], KernelFunction)
+    assert second is not first
+    assert second[0] is first[0]
+    assert [function.name for function in OtherTools.get_kernel_function_objects()] == [
+        "summarize_filing"
+    ]
+
+
+def test_to_json_accepts_non_str_keys():
+    """Test that keys json.dumps would coerce are written as strings."""
+    assert from_json(to_json({1: "a", date(2024, 1, 2): "b"})) == {
+        "1": "a",
+        "2024-01-02": "b",
+    }
+    assert from_json(to_json({np.float64(2.5): np.int64(3)}, indent=True)) == {"2.5": 3}
@@ -0,0 +1,18 @@
+import inspect
+
+import pytest
+
+from kernel_tools.web_tools import WebTools
+
+
+@pytest.mark.parametrize("tool", sorted(WebTools.get_all_kernel_functions()))
+def test_search_request_names_company_and_formatting(tool):
+    """Test that each search request is filled in for the requested company."""
+    function = getattr(WebTools, tool)
+    assert not inspect.iscoroutinefunction(function)
+
+    result = function("Contoso {Holdings}")
+
+    assert "Contoso {Holdings}" in result
+    assert "{company_name}" not in result
+    assert WebTools.formatting_instructions in result
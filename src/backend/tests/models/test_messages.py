@@ -1,6 +1,9 @@
 # File: test_message.py
 
 import uuid
+
+import pytest
+
 from models.messages_kernel import (
     DataType,
     AgentType,
@@ -16,6 +19,12 @@ from models.messages_kernel import (
 )
 
 
+@pytest.fixture(scope="module")
+def ids():
+    """Plan, session, user and step ids shared by the tests in this module."""
+    return {key: str(uuid.uuid4()) for key in ("plan", "session", "user", "step")}
+
+
 def test_enum_values():
     """Test enumeration values for consistency."""
     assert DataType.session == "session"
@@ -26,28 +35,28 @@ def test_enum_values():
     assert HumanFeedbackStatus.requested == "requested"
 
 
-def test_plan_with_steps_update_counts():
+def test_plan_with_steps_update_counts(ids):
     """Test the update_step_counts method in PlanWithSteps."""
     step1 = Step(
-        plan_id=str(uuid.uuid4()),
+        plan_id=ids["plan"],
         action="Review document",
         agent=AgentType.HUMAN,
         status=StepStatus.completed,
-        session_id=str(uuid.uuid4()),
-        user_id=str(uuid.uuid4()),
+        session_id=ids["session"],
+        user_id=ids["user"],
     )
     step2 = Step(
-        plan_id=str(uuid.uuid4()),
+        plan_id=ids["plan"],
         action="Find information about Microsoft",
         agent=AgentType.COMPANY,
         status=StepStatus.failed,
-        session_id=str(uuid.uuid4()),
-        user_id=str(uuid.uuid4()),
+        session_id=ids["session"],
+        user_id=ids["user"],
     )
     plan = PlanWithSteps(
         steps=[step1, step2],
-        session_id=str(uuid.uuid4()),
-        user_id=str(uuid.uuid4()),
+        session_id=ids["session"],
+        user_id=ids["user"],
         initial_goal="Test plan goal",
     )
     plan.update_step_counts()
@@ -58,12 +67,12 @@ def test_plan_with_steps_update_counts():
     assert plan.overall_status == PlanStatus.completed
 
 
-def test_agent_message_creation():
+def test_agent_message_creation(ids):
     """Test creation of an AgentMessage."""
     agent_message = AgentMessage(
-        session_id=str(uuid.uuid4()),
-        user_id=str(uuid.uuid4()),
-        plan_id=str(uuid.uuid4()),
+        session_id=ids["session"],
+        user_id=ids["user"],
+        plan_id=ids["plan"],
         content="Test message content",
         source="System",
     )
@@ -71,12 +80,12 @@ def test_agent_message_creation():
     assert agent_message.content == "Test message content"
 
 
-def test_action_request_creation():
+def test_action_request_creation(ids):
     """Test the creation of ActionRequest."""
     action_request = ActionRequest(
-        step_id=str(uuid.uuid4()),
-        plan_id=str(uuid.uuid4()),
-        session_id=str(uuid.uuid4()),
+        step_id=ids["step"],
+        plan_id=ids["plan"],
+        session_id=ids["session"],
         action="Calculate the z-score",
         agent=AgentType.FUNDAMENTAL,
     )
@@ -84,12 +93,12 @@ def test_action_request_creation():
     assert action_request.agent == AgentType.FUNDAMENTAL
 
 
-def test_human_feedback_creation():
+def test_human_feedback_creation(ids):
     """Test HumanFeedback creation."""
     human_feedback = HumanFeedback(
-        step_id=str(uuid.uuid4()),
-        plan_id=str(uuid.uuid4()),
-        session_id=str(uuid.uuid4()),
+        step_id=ids["step"],
+        plan_id=ids["plan"],
+        session_id=ids["session"],
         approved=True,
         human_feedback="Looks good!",
     )
@@ -97,11 +106,11 @@ def test_human_feedback_creation():
     assert human_feedback.human_feedback == "Looks good!"
 
 
-def test_plan_initialization():
+def test_plan_initialization(ids):
     """Test Plan model initialization."""
     plan = Plan(
-        session_id=str(uuid.uuid4()),
-        user_id=str(uuid.uuid4()),
+        session_id=ids["session"],
+        user_id=ids["user"],
         initial_goal="Complete document processing",
     )
     assert plan.data_type == "plan"
@@ -109,14 +118,14 @@ def test_plan_initialization():
     assert plan.overall_status == PlanStatus.in_progress
 
 
-def test_step_defaults():
+def test_step_defaults(ids):
     """Test default values for Step model."""
     step = Step(
-        plan_id=str(uuid.uuid4()),
+        plan_id=ids["plan"],
         action="Prepare report",
         agent=AgentType.GENERIC,
-        session_id=str(uuid.uuid4()),
-        user_id=str(uuid.uuid4()),
+        session_id=ids["session"],
+        user_id=ids["user"],
     )
     assert step.status == StepStatus.planned
     assert step.human_approval_status == HumanFeedbackStatus.requested